@@ -3,11 +3,14 @@ from django_typify.factories import (
     find_factory_files,
     process_factory_file,
 )
+from django_typify.dedupe import AnalysisCache
+from django_typify.limits import ConfigError, FileSkipped, load_limits_config
 from django_typify.models import (
     add_models_subcommand,
     find_model_files,
     process_models_file,
 )
+from django_typify.prefetch import load_prefetching_io
 from django_typify.views import (
     add_views_subcommand,
     find_view_files,
@@ -17,10 +20,14 @@ from django_typify.views import (
 
 def main():
     import argparse
+    import time
 
     parser = argparse.ArgumentParser(
         description="Annotate Django model reverse relations."
     )
+    parser.add_argument(
+        "--stats", action="store_true", help="Print timing statistics after the run."
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     add_models_subcommand(subparsers)
@@ -28,16 +35,48 @@ def main():
     add_views_subcommand(subparsers)
 
     args = parser.parse_args()
+    try:
+        limits_config = load_limits_config(args.path, args)
+        io = load_prefetching_io(args.path, args)
+    except ConfigError as e:
+        parser.error(str(e))
 
     if args.command == "annotate-models":
-        for file_path in find_model_files(args.path):
-            process_models_file(file_path)
+        find_files, process_file = find_model_files, process_models_file
     elif args.command == "annotate-factories":
-        for file_path in find_factory_files(args.path):
-            process_factory_file(file_path)
+        find_files, process_file = find_factory_files, process_factory_file
     elif args.command == "annotate-views":
-        for file_path in find_view_files(args.path):
-            process_views_file(file_path)
+        find_files, process_file = find_view_files, process_views_file
+
+    started = time.monotonic()
+    file_count = 0
+    skipped = []
+    cache = AnalysisCache()
+    with io:
+        files = io.read_ahead(find_files(args.path), limits_config.for_path)
+        for file_path, limits, read in files:
+            file_count += 1
+            try:
+                process_file(file_path, limits, read=read, write=io.write, cache=cache)
+            except FileSkipped as e:
+                skipped.append(e)
+
+    if skipped:
+        print(f"Skipped {len(skipped)} file(s) exceeding limits:")
+        for skip in skipped:
+            print(f"  {skip.path}: {skip.reason}")
+
+    if args.stats:
+        elapsed = time.monotonic() - started
+        print(f"Processed {file_count} file(s) in {elapsed:.3f}s")
+        print(f"  I/O threads: {io.workers}, read-ahead window: {io.window}")
+        print(f"  Time waiting on discovery: {io.discovery_wait:.3f}s")
+        print(f"  Time waiting on reads: {io.read_wait:.3f}s")
+        print(
+            f"  Duplicate content reused: {cache.hits} of "
+            f"{cache.hits + cache.misses} analysed file(s) "
+            f"({cache.hit_rate:.0%} hit rate)"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+import hashlib
+
+from typing import Callable, Dict, Optional, Tuple
+
+from django_typify.limits import Deadline, FileLimits, FileSkipped
+
+Processor = Callable[[str, Optional[Deadline]], Tuple[bool, str]]
+
+
+class AnalysisCache:
+    """
+    Memoises per-file analysis by content hash for the duration of a run.
+
+    Byte-identical files (vendored apps, copied templates, generated tenants)
+    are analysed once and the computed edits are reused for every duplicate
+    path. Results are keyed by the processing function as well as the content,
+    so one cache can safely be shared between subcommands. Unchanged files
+    are remembered without their text, so the cache holds only the edited
+    sources. Files skipped for exceeding their time budget are remembered
+    too, so a pathological file only burns its budget once.
+    """
+
+    def __init__(self) -> None:
+        # None marks content the processor left unchanged.
+        self._results: Dict[Tuple[Processor, str], Optional[str]] = {}
+        self._skipped: Dict[Tuple[Processor, str, Optional[float]], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def analyse(
+        self, path: str, source: str, limits: FileLimits, process: Processor
+    ) -> Tuple[bool, str]:
+        """Returns process(source, deadline), running it only for new content."""
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        key = (process, digest)
+        skip_key = (process, digest, limits.max_seconds)
+        if key in self._results:
+            self.hits += 1
+            updated = self._results[key]
+            return (False, source) if updated is None else (True, updated)
+        if skip_key in self._skipped:
+            self.hits += 1
+            raise FileSkipped(path, self._skipped[skip_key])
+
+        self.misses += 1
+        try:
+            result = process(source, limits.deadline(path))
+        except FileSkipped as e:
+            self._skipped[skip_key] = e.reason
+            raise
+        modified, updated = result
+        self._results[key] = updated if modified else None
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def analyse_source(
+    path: str,
+    source: str,
+    limits: FileLimits,
+    process: Processor,
+    cache: Optional[AnalysisCache] = None,
+) -> Tuple[bool, str]:
+    """Runs process(source, deadline), going through the cache when one is given."""
+    if cache is None:
+        return process(source, limits.deadline(path))
+    return cache.analyse(path, source, limits, process)
@@ -1,6 +1,17 @@
 import ast
 import os
 
+from typing import Callable, Optional, Tuple
+
+from django_typify.dedupe import AnalysisCache, analyse_source
+from django_typify.limits import (
+    Deadline,
+    FileLimits,
+    add_limit_arguments,
+    read_source,
+)
+from django_typify.prefetch import WriteCallback, add_io_arguments, write_file
+
 def add_factories_subcommand(subparsers):
     annotate_factories_parser = subparsers.add_parser(
         "annotate-factories",
@@ -9,6 +20,8 @@ def add_factories_subcommand(subparsers):
     annotate_factories_parser.add_argument(
         "path", help="Path to the root of the Django project"
     )
+    add_limit_arguments(annotate_factories_parser)
+    add_io_arguments(annotate_factories_parser)
 
 def find_factory_files(root: str):
     for dirpath, _, filenames in os.walk(root):
@@ -17,16 +30,17 @@ def find_factory_files(root: str):
                 yield os.path.join(dirpath, f)
 
 
-def process_factory_file(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        source = f.read()
-
+def process_factory_source(
+    source: str, deadline: Optional[Deadline] = None
+) -> Tuple[bool, str]:
     tree = ast.parse(source)
     lines = source.splitlines()
     updated_lines = lines[:]
     needs_import = False
 
     for node in tree.body:
+        if deadline:
+            deadline.check()
         if not isinstance(node, ast.ClassDef):
             continue
         
@@ -69,9 +83,29 @@ def process_factory_file(path: str):
 
     # Check if any changes were made
     if updated_lines != lines:
-        updated_source = "\n".join(updated_lines)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(updated_source)
-        print(f"✅ Updated {path}")
+        return True, "\n".join(updated_lines)
+    return False, source
+
+
+def process_factory_file(
+    path: str,
+    limits: Optional[FileLimits] = None,
+    read: Optional[Callable[[], str]] = None,
+    write: Callable[[str, str, WriteCallback], None] = write_file,
+    cache: Optional[AnalysisCache] = None,
+):
+    limits = limits or FileLimits()
+    source = read() if read else read_source(path, limits)
+
+    modified, updated_source = analyse_source(
+        path, source, limits, process_factory_source, cache
+    )
+    if modified:
+
+        def written(future):
+            future.result()
+            print(f"✅ Updated {path}")
+
+        write(path, updated_source, written)
     else:
         print(f"— No changes in {path}")
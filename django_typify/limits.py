@@ -0,0 +1,219 @@
+import argparse
+import fnmatch
+import os
+import time
+import tomllib
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+CONFIG_SECTION = "django-typify"
+
+LIMIT_KEYS = {"max-bytes": (int,), "max-lines": (int,), "max-seconds": (int, float)}
+CONFIG_KEYS = {*LIMIT_KEYS, "overrides", "io-threads", "prefetch"}
+
+
+class ConfigError(ValueError):
+    """Raised when [tool.django-typify] in pyproject.toml is malformed."""
+
+
+class FileSkipped(Exception):
+    """Raised when a file exceeds one of its size or time budgets."""
+
+    def __init__(self, path: str, reason: str):
+        super().__init__(f"{path}: {reason}")
+        self.path = path
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class FileLimits:
+    max_bytes: Optional[int] = None
+    max_lines: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    def check_size(self, path: str, size: int):
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise FileSkipped(path, f"{size} bytes exceeds limit of {self.max_bytes}")
+
+    def check_lines(self, path: str, source: str):
+        if self.max_lines is None:
+            return
+        line_count = len(source.splitlines())
+        if line_count > self.max_lines:
+            raise FileSkipped(
+                path, f"{line_count} lines exceeds limit of {self.max_lines}"
+            )
+
+    def deadline(self, path: str) -> "Deadline":
+        return Deadline(path, self.max_seconds)
+
+
+class Deadline:
+    """Cooperative time budget checked from inside the analysis loops."""
+
+    def __init__(self, path: str, max_seconds: Optional[float]):
+        self.path = path
+        self.max_seconds = max_seconds
+        self.started = time.monotonic()
+
+    def check(self):
+        if self.max_seconds is None:
+            return
+        elapsed = time.monotonic() - self.started
+        if elapsed > self.max_seconds:
+            raise FileSkipped(
+                self.path,
+                f"analysis took over {self.max_seconds}s (limit exceeded)",
+            )
+
+
+def _check_keys(table: dict, allowed, where: str):
+    unknown = sorted(set(table) - set(allowed))
+    if unknown:
+        raise ConfigError(
+            f"pyproject.toml: unknown key(s) {', '.join(unknown)} in {where}"
+        )
+
+
+def _limits_from_table(table: dict, base: FileLimits, where: str) -> FileLimits:
+    values: Dict[str, Any] = {}
+    for key, types in LIMIT_KEYS.items():
+        if key not in table:
+            continue
+        value = table[key]
+        if isinstance(value, bool) or not isinstance(value, types):
+            expected = " or ".join(t.__name__ for t in types)
+            raise ConfigError(
+                f"pyproject.toml: {key} in {where} must be {expected}, "
+                f"got {value!r}"
+            )
+        if value < 0:
+            raise ConfigError(
+                f"pyproject.toml: {key} in {where} must not be negative, "
+                f"got {value!r}"
+            )
+        values[key.replace("-", "_")] = value
+    return replace(base, **values)
+
+
+@dataclass
+class LimitsConfig:
+    """
+    Default limits plus per-file overrides.
+
+    Overrides are matched in order against the path relative to the project
+    root using shell-style globs; the last matching override wins.
+    """
+
+    root: str = "."
+    default: FileLimits = field(default_factory=FileLimits)
+    overrides: List[Tuple[str, FileLimits]] = field(default_factory=list)
+
+    def for_path(self, path: str) -> FileLimits:
+        relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+        limits = self.default
+        for pattern, override in self.overrides:
+            if fnmatch.fnmatch(relative, pattern):
+                limits = override
+        return limits
+
+
+def read_tool_config(root: str) -> dict:
+    """Returns the [tool.django-typify] table of the project's pyproject.toml."""
+    pyproject = os.path.join(root, "pyproject.toml")
+    if not os.path.isfile(pyproject):
+        return {}
+    with open(pyproject, "rb") as f:
+        try:
+            tool = tomllib.load(f).get("tool", {})
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"pyproject.toml: invalid TOML: {e}") from e
+    where = f"[tool.{CONFIG_SECTION}]"
+    table = tool.get(CONFIG_SECTION, {}) if isinstance(tool, dict) else {}
+    if not isinstance(table, dict):
+        raise ConfigError(f"pyproject.toml: {where} must be a table")
+    _check_keys(table, CONFIG_KEYS, where)
+    overrides = table.get("overrides", [])
+    if not isinstance(overrides, list):
+        raise ConfigError(
+            f"pyproject.toml: overrides in {where} must be an array of tables"
+        )
+    for index, override in enumerate(overrides):
+        if not isinstance(override, dict):
+            raise ConfigError(
+                f"pyproject.toml: [[tool.{CONFIG_SECTION}.overrides]] "
+                f"entry {index + 1} must be a table"
+            )
+    return table
+
+
+def load_limits_config(root: str, args=None) -> LimitsConfig:
+    """
+    Reads limits from [tool.django-typify] in the project's pyproject.toml.
+
+    Command line flags replace the configured defaults, while per-file
+    overrides from [[tool.django-typify.overrides]] still apply on top.
+    """
+    table = read_tool_config(root)
+    default = _limits_from_table(table, FileLimits(), f"[tool.{CONFIG_SECTION}]")
+    if args is not None:
+        cli_values = {
+            name: getattr(args, name)
+            for name in ("max_bytes", "max_lines", "max_seconds")
+            if getattr(args, name, None) is not None
+        }
+        default = replace(default, **cli_values)
+
+    overrides = []
+    for index, override in enumerate(table.get("overrides", [])):
+        where = f"[[tool.{CONFIG_SECTION}.overrides]] entry {index + 1}"
+        _check_keys(override, {"path", *LIMIT_KEYS}, where)
+        if not isinstance(override.get("path"), str):
+            raise ConfigError(f"pyproject.toml: {where} needs a string path")
+        overrides.append(
+            (override["path"], _limits_from_table(override, default, where))
+        )
+    return LimitsConfig(root=root, default=default, overrides=overrides)
+
+
+def non_negative(type_):
+    """Builds an argparse type that rejects values below zero."""
+
+    def parse(value: str):
+        parsed = type_(value)
+        if parsed < 0:
+            raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+        return parsed
+
+    parse.__name__ = type_.__name__
+    return parse
+
+
+def add_limit_arguments(parser):
+    parser.add_argument(
+        "--max-bytes",
+        type=non_negative(int),
+        help="Skip files larger than this many bytes.",
+    )
+    parser.add_argument(
+        "--max-lines",
+        type=non_negative(int),
+        help="Skip files with more than this many lines.",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=non_negative(float),
+        help="Skip files whose analysis takes longer than this many seconds.",
+    )
+
+
+def read_source(path: str, limits: Optional[FileLimits] = None) -> str:
+    """Reads a file, enforcing byte and line limits before any parsing."""
+    limits = limits or FileLimits()
+    limits.check_size(path, os.stat(path).st_size)
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    limits.check_lines(path, source)
+    return source
@@ -1,7 +1,16 @@
 import ast
 import os
 
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django_typify.dedupe import AnalysisCache, analyse_source
+from django_typify.limits import (
+    Deadline,
+    FileLimits,
+    add_limit_arguments,
+    read_source,
+)
+from django_typify.prefetch import WriteCallback, add_io_arguments, write_file
 
 
 def add_models_subcommand(subparsers):
@@ -9,6 +18,8 @@ def add_models_subcommand(subparsers):
         "annotate-models", help="Annotate Django models with reverse relations."
     )
     annotate_parser.add_argument("path", help="Path to the root of the Django project")
+    add_limit_arguments(annotate_parser)
+    add_io_arguments(annotate_parser)
 
 
 def get_model_classes_from_ast(tree: ast.AST) -> Dict[str, ast.ClassDef]:
@@ -26,11 +37,15 @@ def get_model_classes_from_ast(tree: ast.AST) -> Dict[str, ast.ClassDef]:
     return model_classes
 
 
-def extract_reverse_relations(tree: ast.AST) -> List[Tuple[str, str, str]]:
+def extract_reverse_relations(
+    tree: ast.AST, deadline: Optional[Deadline] = None
+) -> List[Tuple[str, str, str]]:
     """Returns list of (target_model, related_name, source_model)"""
     relations = []
 
     for class_node in [n for n in tree.body if isinstance(n, ast.ClassDef)]:
+        if deadline:
+            deadline.check()
         current_model = class_node.name
 
         for stmt in class_node.body:
@@ -99,7 +114,9 @@ def create_annotation(name: str, model: str) -> str:
 
 
 def annotate_model_source(
-    source: str, annotations: Dict[str, List[Tuple[str, str]]]
+    source: str,
+    annotations: Dict[str, List[Tuple[str, str]]],
+    deadline: Optional[Deadline] = None,
 ) -> str:
     tree = ast.parse(source)
     lines = source.splitlines()
@@ -113,6 +130,8 @@ def annotate_model_source(
                 insert_line - 1
             ].strip().endswith(":"):
                 insert_line += 1
+                if deadline:
+                    deadline.check()
 
             if (
                 class_node.body
@@ -147,22 +166,43 @@ def find_model_files(root: str):
                 yield os.path.join(dirpath, f)
 
 
-def process_models_file(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        source = f.read()
-
+def process_models_source(
+    source: str, deadline: Optional[Deadline] = None
+) -> Tuple[bool, str]:
     tree = ast.parse(source)
-    reverse_relations = extract_reverse_relations(tree)
+    if deadline:
+        deadline.check()
+    reverse_relations = extract_reverse_relations(tree, deadline)
 
     annotations = {}
     for to_model, related_name, from_model in reverse_relations:
         annotations.setdefault(to_model, []).append((related_name, from_model))
 
     if not annotations:
+        return False, source
+
+    return True, annotate_model_source(source, annotations, deadline)
+
+
+def process_models_file(
+    path: str,
+    limits: Optional[FileLimits] = None,
+    read: Optional[Callable[[], str]] = None,
+    write: Callable[[str, str, WriteCallback], None] = write_file,
+    cache: Optional[AnalysisCache] = None,
+):
+    limits = limits or FileLimits()
+    source = read() if read else read_source(path, limits)
+
+    modified, updated = analyse_source(
+        path, source, limits, process_models_source, cache
+    )
+    if not modified:
         print(f"— No changes in {path}")
         return
 
-    updated = annotate_model_source(source, annotations)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(updated)
-    print(f"✅ Updated {path}")
+    def written(future):
+        future.result()
+        print(f"✅ Updated {path}")
+
+    write(path, updated, written)
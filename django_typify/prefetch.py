@@ -0,0 +1,273 @@
+import queue
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Optional, Tuple, Union
+
+from django_typify.limits import (
+    CONFIG_SECTION,
+    ConfigError,
+    FileLimits,
+    non_negative,
+    read_source,
+    read_tool_config,
+)
+
+WriteCallback = Callable[["Future[None]"], None]
+Prefetched = Tuple[str, FileLimits, Callable[[], str]]
+
+_DISCOVERY_DONE = object()
+
+
+def write_source(path: str, source: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+
+
+def write_file(
+    path: str,
+    source: str,
+    on_done: WriteCallback,
+    write: Callable[[str, str], None] = write_source,
+):
+    """
+    Writes a file inline and hands the outcome to on_done as a resolved future.
+
+    This is the serial counterpart of PrefetchingIO.write: on_done calls
+    future.result() to re-raise a failed write or reports success.
+    """
+    future: "Future[None]" = Future()
+    try:
+        write(path, source)
+        future.set_result(None)
+    except Exception as e:
+        future.set_exception(e)
+    on_done(future)
+
+
+def add_io_arguments(parser):
+    parser.add_argument(
+        "--io-threads",
+        type=non_negative(int),
+        help="Threads used to prefetch reads and overlap writes (0 reads serially).",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=non_negative(int),
+        help="How many files to read and write ahead of analysis "
+        "(default: 2 per thread).",
+    )
+
+
+class PrefetchingIO:
+    """
+    Overlaps discovery, file reads and writes with analysis.
+
+    Discovery runs in its own thread feeding a bounded queue, and at most
+    ``window`` reads are kept in flight on a small thread pool ahead of the
+    file currently being analysed. Writes go to the same pool; at most
+    ``window`` are pending at once, and their on_done callbacks run on the
+    calling thread in submission order. With ``workers=0`` everything happens
+    inline, matching a plain serial run.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        window: Optional[int] = None,
+        read: Callable[[str, FileLimits], str] = read_source,
+        write: Callable[[str, str], None] = write_source,
+    ):
+        self.workers = workers
+        self.window = window if window is not None else 2 * workers
+        self._read = read
+        self._write = write
+        self._executor = ThreadPoolExecutor(workers) if workers > 0 else None
+        self._pending_writes: Deque[Tuple["Future[None]", WriteCallback]] = deque()
+        self.read_wait = 0.0
+        self.discovery_wait = 0.0
+
+    def _load(self, path: str, limits: FileLimits) -> Callable[[], str]:
+        load: Callable[[], str]
+        if self._executor is None:
+            load = lambda: self._read(path, limits)
+        else:
+            future = self._executor.submit(self._read, path, limits)
+            load = lambda: future.result()
+
+        def wait() -> str:
+            started = time.monotonic()
+            try:
+                return load()
+            finally:
+                self.read_wait += time.monotonic() - started
+
+        return wait
+
+    def _discover(
+        self, paths: Iterable[str], stop: threading.Event
+    ) -> Callable[[bool], Union[str, None, object]]:
+        """
+        Returns next_path(block) pulling from discovery.
+
+        In threaded mode discovery is advanced by a producer thread so that
+        directory listing overlaps with analysis. next_path returns None when
+        nothing is ready without blocking and _DISCOVERY_DONE at the end.
+        """
+        if self._executor is None:
+            iterator = iter(paths)
+            return lambda block: next(iterator, _DISCOVERY_DONE)
+
+        found: "queue.Queue[object]" = queue.Queue(maxsize=max(self.window, 1))
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    found.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce():
+            try:
+                for path in paths:
+                    if stop.is_set():
+                        return
+                    put(path)
+            except BaseException as e:
+                put(e)
+            else:
+                put(_DISCOVERY_DONE)
+
+        threading.Thread(target=produce, daemon=True).start()
+
+        def next_path(block: bool) -> Union[str, None, object]:
+            try:
+                item = found.get(block=block)
+            except queue.Empty:
+                return None
+            if isinstance(item, BaseException):
+                raise item
+            return item
+
+        return next_path
+
+    def read_ahead(
+        self,
+        paths: Iterable[str],
+        limits_for: Callable[[str], FileLimits],
+    ) -> Iterator[Prefetched]:
+        """Yields (path, limits, read) where read() returns the prefetched source."""
+        in_flight: Deque[Prefetched] = deque()
+        window = max(self.window, 1)
+        stop = threading.Event()
+        next_path = self._discover(paths, stop)
+        exhausted = False
+
+        def pull(block: bool) -> bool:
+            """Queues one more read if discovery has a path; returns False if not."""
+            nonlocal exhausted
+            started = time.monotonic()
+            try:
+                path = next_path(block)
+            finally:
+                self.discovery_wait += time.monotonic() - started
+            if path is None:
+                return False
+            if path is _DISCOVERY_DONE:
+                exhausted = True
+                return False
+            assert isinstance(path, str)
+            limits = limits_for(path)
+            in_flight.append((path, limits, self._load(path, limits)))
+            return True
+
+        def fill():
+            while not exhausted and len(in_flight) < window and pull(block=False):
+                pass
+
+        try:
+            while True:
+                fill()
+                if not in_flight:
+                    if exhausted:
+                        return
+                    # Nothing is ready to hand out, so wait for discovery.
+                    pull(block=True)
+                    continue
+                item = in_flight.popleft()
+                fill()
+                yield item
+        finally:
+            stop.set()
+
+    def _complete_writes(self, keep: int = 0):
+        """Resolves finished writes in order, waiting until at most keep remain."""
+        pending = self._pending_writes
+        while pending and (len(pending) > keep or pending[0][0].done()):
+            future, on_done = pending.popleft()
+            future.exception()  # waits for the write to finish
+            on_done(future)
+
+    def write(self, path: str, source: str, on_done: WriteCallback):
+        """
+        Writes source to path, calling on_done(future) once the write resolves.
+
+        on_done always runs on the calling thread, so exceptions it raises
+        (e.g. by calling future.result() on a failed write) stop the run.
+        """
+        if self._executor is None:
+            write_file(path, source, on_done, self._write)
+            return
+
+        self._complete_writes(keep=max(self.window, 1) - 1)
+        self._pending_writes.append(
+            (self._executor.submit(self._write, path, source), on_done)
+        )
+
+    def close(self):
+        """Waits for outstanding writes and reports their outcome."""
+        try:
+            self._complete_writes()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _config_int(table: dict, key: str) -> Optional[int]:
+    value = table.get(key)
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ConfigError(
+            f"pyproject.toml: {key} in [tool.{CONFIG_SECTION}] must be int, "
+            f"got {value!r}"
+        )
+    if value is not None and value < 0:
+        raise ConfigError(
+            f"pyproject.toml: {key} in [tool.{CONFIG_SECTION}] must not be "
+            f"negative, got {value!r}"
+        )
+    return value
+
+
+def load_prefetching_io(root: str, args=None) -> PrefetchingIO:
+    """
+    Builds the I/O pipeline from io-threads/prefetch in [tool.django-typify],
+    with command line flags taking precedence.
+    """
+    table = read_tool_config(root)
+    workers = _config_int(table, "io-threads") or 0
+    window = _config_int(table, "prefetch")
+    if args is not None:
+        if getattr(args, "io_threads", None) is not None:
+            workers = args.io_threads
+        if getattr(args, "prefetch", None) is not None:
+            window = args.prefetch
+    return PrefetchingIO(workers=workers, window=window)
@@ -2,6 +2,17 @@ import ast
 import os
 
 from ast import get_source_segment
+from typing import Callable, Optional
+
+from django_typify.dedupe import AnalysisCache, analyse_source
+from django_typify.limits import (
+    Deadline,
+    FileLimits,
+    FileSkipped,
+    add_limit_arguments,
+    read_source,
+)
+from django_typify.prefetch import WriteCallback, add_io_arguments, write_file
 
 
 def add_views_subcommand(subparsers):
@@ -12,6 +23,8 @@ def add_views_subcommand(subparsers):
     annotate_views_parser.add_argument(
         "path", help="Path to the root of the Django project"
     )
+    add_limit_arguments(annotate_views_parser)
+    add_io_arguments(annotate_views_parser)
     # Optional: Add flag to control overwrite behavior or output diff
     # annotate_views_parser.add_argument(
     #     "--dry-run", action="store_true", help="Print changes instead of modifying files."
@@ -129,13 +142,15 @@ def _extract_model_from_queryset(node_value: ast.expr) -> tuple[str | None, str
     return None, None
 
 
-def process_one_file(source: str):
+def process_one_file(source: str, deadline: Optional[Deadline] = None):
     tree = ast.parse(source)
     lines = source.splitlines()
     updated_lines = lines[:]
     modified = False
 
     for node in ast.walk(tree):
+        if deadline:
+            deadline.check()
         if not isinstance(node, ast.ClassDef):
             continue
 
@@ -177,6 +192,8 @@ def process_one_file(source: str):
             # Use ast.walk to find assignments anywhere within the method,
             # including nested blocks (if, for, etc.)
             for stmt in ast.walk(method):
+                if deadline:
+                    deadline.check()
                 if not isinstance(stmt, ast.Assign):
                     continue
 
@@ -291,28 +308,41 @@ def process_one_file(source: str):
     return modified, updated_source
 
 
-def process_views_file(path: str):
+def process_views_file(
+    path: str,
+    limits: Optional[FileLimits] = None,
+    read: Optional[Callable[[], str]] = None,
+    write: Callable[[str, str, WriteCallback], None] = write_file,
+    cache: Optional[AnalysisCache] = None,
+):
     """Parses a views.py file and adds type hints where possible."""
+    limits = limits or FileLimits()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            source = f.read()
+        source = read() if read else read_source(path, limits)
+    except FileSkipped:
+        raise
     except Exception as e:
         print(f"Error reading {path}: {e}")
         return
 
     try:
-        modified, updated_source = process_one_file(source)
+        modified, updated_source = analyse_source(
+            path, source, limits, process_one_file, cache
+        )
     except SyntaxError as e:
         print("Error parsing file:", path, e)
         return
 
     # Write changes back to the file if modified
     if modified:
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(updated_source)
-            print(f"✅ Annotated {path}")
-        except Exception as e:
-            print(f"Error writing changes to {path}: {e}")
+
+        def written(future):
+            try:
+                future.result()
+                print(f"✅ Annotated {path}")
+            except Exception as e:
+                print(f"Error writing changes to {path}: {e}")
+
+        write(path, updated_source, written)
     else:
         print(f"— No changes needed in {path}")
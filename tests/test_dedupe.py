@@ -0,0 +1,143 @@
+import sys
+
+import pytest
+
+from django_typify import cli, models, views
+from django_typify.dedupe import AnalysisCache
+from django_typify.limits import FileLimits, FileSkipped
+
+MODELS_SOURCE = """from django.db import models
+
+class User(models.Model):
+    pass
+
+class Post(models.Model):
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
+"""
+
+VIEWS_SOURCE = """
+class PostViewSet(viewsets.ModelViewSet):
+    queryset = models.Post.objects.all()
+
+    def publish(self, request, uuid=None):
+        post = self.get_object()
+"""
+
+
+def write_copies(root, name, source, count):
+    paths = []
+    for i in range(count):
+        app = root / f"app{i}"
+        app.mkdir()
+        (app / name).write_text(source)
+        paths.append(app / name)
+    return paths
+
+
+def test_identical_sources_are_analysed_once():
+    cache = AnalysisCache()
+    calls = []
+
+    def process(source, deadline):
+        calls.append(source)
+        return True, "updated"
+
+    for path in ("a/models.py", "b/models.py", "c/models.py"):
+        assert cache.analyse(path, "source", FileLimits(), process) == (True, "updated")
+    cache.analyse("d/models.py", "other source", FileLimits(), process)
+
+    assert calls == ["source", "other source"]
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.hit_rate == 0.5
+
+
+def test_results_are_keyed_by_processor():
+    cache = AnalysisCache()
+
+    def first(source, deadline):
+        return True, "first"
+
+    def second(source, deadline):
+        return True, "second"
+
+    assert cache.analyse("models.py", "source", FileLimits(), first)[1] == "first"
+    assert cache.analyse("factories.py", "source", FileLimits(), second)[1] == "second"
+    assert cache.hits == 0
+
+
+def test_processors_with_the_same_qualname_do_not_share_results():
+    def make(result):
+        def process(source, deadline):
+            return True, result
+
+        return process
+
+    cache = AnalysisCache()
+
+    assert cache.analyse("a.py", "source", FileLimits(), make("first"))[1] == "first"
+    assert cache.analyse("b.py", "source", FileLimits(), make("second"))[1] == "second"
+
+
+def test_unchanged_results_do_not_keep_the_source():
+    cache = AnalysisCache()
+
+    def process(source, deadline):
+        return False, source
+
+    assert cache.analyse("a.py", "source", FileLimits(), process) == (False, "source")
+    assert cache.analyse("b.py", "source", FileLimits(), process) == (False, "source")
+    assert list(cache._results.values()) == [None]
+
+
+def test_skipped_duplicates_report_their_own_path():
+    cache = AnalysisCache()
+
+    def process(source, deadline):
+        raise FileSkipped(deadline.path, "analysis took over 1s (limit exceeded)")
+
+    with pytest.raises(FileSkipped):
+        cache.analyse("a/views.py", "source", FileLimits(max_seconds=1), process)
+    with pytest.raises(FileSkipped) as exc_info:
+        cache.analyse("b/views.py", "source", FileLimits(max_seconds=1), process)
+
+    assert exc_info.value.path == "b/views.py"
+    assert cache.hits == 1
+
+
+def test_duplicate_model_files_are_all_rewritten(tmp_path):
+    paths = write_copies(tmp_path, "models.py", MODELS_SOURCE, 3)
+    cache = AnalysisCache()
+
+    for path in paths:
+        models.process_models_file(str(path), cache=cache)
+
+    expected = models.process_models_source(MODELS_SOURCE)[1]
+    assert "posts: models.Manager['Post']" in expected
+    assert all(path.read_text() == expected for path in paths)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_duplicate_view_files_are_all_rewritten(tmp_path):
+    paths = write_copies(tmp_path, "views.py", VIEWS_SOURCE, 3)
+    cache = AnalysisCache()
+
+    for path in paths:
+        views.process_views_file(str(path), cache=cache)
+
+    assert all(
+        "post: models.Post = self.get_object()" in path.read_text() for path in paths
+    )
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_stats_report_dedupe_hit_rate(tmp_path, monkeypatch, capsys):
+    paths = write_copies(tmp_path, "models.py", MODELS_SOURCE, 4)
+    monkeypatch.setattr(
+        sys, "argv", ["django_typify", "--stats", "annotate-models", str(tmp_path)]
+    )
+
+    cli.main()
+
+    output = capsys.readouterr().out
+    assert "Duplicate content reused: 3 of 4 analysed file(s) (75% hit rate)" in output
+    assert all("Manager['Post']" in path.read_text() for path in paths)
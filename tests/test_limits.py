@@ -0,0 +1,127 @@
+import argparse
+
+import pytest
+
+from django_typify import views
+from django_typify.limits import (
+    ConfigError,
+    Deadline,
+    FileLimits,
+    FileSkipped,
+    add_limit_arguments,
+    load_limits_config,
+    read_source,
+)
+
+
+def test_read_source_skips_files_over_byte_limit(tmp_path):
+    path = tmp_path / "models.py"
+    path.write_text("x = 1\n" * 10)
+
+    with pytest.raises(FileSkipped) as exc_info:
+        read_source(str(path), FileLimits(max_bytes=10))
+
+    assert "bytes exceeds limit of 10" in exc_info.value.reason
+
+
+def test_read_source_skips_files_over_line_limit(tmp_path):
+    path = tmp_path / "models.py"
+    path.write_text("x = 1\n" * 10)
+
+    with pytest.raises(FileSkipped):
+        read_source(str(path), FileLimits(max_lines=5))
+
+    assert read_source(str(path), FileLimits(max_lines=20)) == "x = 1\n" * 10
+
+
+def test_line_limit_boundary(tmp_path):
+    path = tmp_path / "models.py"
+    path.write_text("x = 1\n" * 10)
+
+    assert read_source(str(path), FileLimits(max_lines=10)) == "x = 1\n" * 10
+    with pytest.raises(FileSkipped) as exc_info:
+        read_source(str(path), FileLimits(max_lines=9))
+
+    assert exc_info.value.reason == "10 lines exceeds limit of 9"
+
+
+def test_empty_file_passes_zero_line_limit(tmp_path):
+    path = tmp_path / "models.py"
+    path.write_text("")
+
+    assert read_source(str(path), FileLimits(max_lines=0)) == ""
+
+
+def test_expired_deadline_stops_analysis():
+    source = """
+class NodeViewSet(viewsets.ModelViewSet):
+    queryset = models.Node.objects.all()
+"""
+    with pytest.raises(FileSkipped):
+        views.process_one_file(source, Deadline("views.py", max_seconds=-1))
+
+
+def test_per_file_overrides_from_pyproject(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        """
+[tool.django-typify]
+max-lines = 100
+
+[[tool.django-typify.overrides]]
+path = "generated/*"
+max-lines = 5000
+max-seconds = 2.5
+"""
+    )
+    config = load_limits_config(str(tmp_path))
+
+    assert config.for_path(str(tmp_path / "app" / "models.py")) == FileLimits(
+        max_lines=100
+    )
+    assert config.for_path(str(tmp_path / "generated" / "views.py")) == FileLimits(
+        max_lines=5000, max_seconds=2.5
+    )
+
+
+@pytest.mark.parametrize(
+    "config, message",
+    [
+        ("max_lines = 10", "unknown key(s) max_lines"),
+        ('max-lines = "10"', "max-lines in [tool.django-typify] must be int"),
+        ("[[tool.django-typify.overrides]]\nmax-lines = 5", "needs a string path"),
+        (
+            '[[tool.django-typify.overrides]]\npath = "a/*"\nmax_seconds = 1',
+            "unknown key(s) max_seconds",
+        ),
+        ("max-lines = -5", "max-lines in [tool.django-typify] must not be negative"),
+        ("overrides = [1]", "entry 1 must be a table"),
+        ('overrides = "a/*"', "overrides in [tool.django-typify] must be an array"),
+        ("max-lines = ", "invalid TOML"),
+    ],
+)
+def test_invalid_config_is_rejected(tmp_path, config, message):
+    (tmp_path / "pyproject.toml").write_text(f"[tool.django-typify]\n{config}\n")
+
+    with pytest.raises(ConfigError) as exc_info:
+        load_limits_config(str(tmp_path))
+
+    assert str(exc_info.value).startswith("pyproject.toml:")
+    assert message in str(exc_info.value)
+
+
+def test_non_table_section_is_rejected(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[tool]\ndjango-typify = 3\n")
+
+    with pytest.raises(ConfigError) as exc_info:
+        load_limits_config(str(tmp_path))
+
+    assert "[tool.django-typify] must be a table" in str(exc_info.value)
+
+
+def test_negative_limits_are_rejected_on_the_command_line():
+    parser = argparse.ArgumentParser()
+    add_limit_arguments(parser)
+
+    assert parser.parse_args(["--max-seconds", "0"]).max_seconds == 0
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--max-seconds", "-1"])
@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+
+from django_typify.limits import ConfigError, FileLimits
+from django_typify.prefetch import PrefetchingIO, load_prefetching_io
+
+
+class RecordingReader:
+    """Read stub that records how many reads overlap and how far ahead they run."""
+
+    def __init__(self, rendezvous=2):
+        self.rendezvous = rendezvous
+        self.lock = threading.Condition()
+        self.started = 0
+        self.active = 0
+        self.consumed = 0
+        self.peak_active = 0
+        self.peak_ahead = 0
+
+    def __call__(self, path, limits):
+        with self.lock:
+            self.started += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            self.peak_ahead = max(self.peak_ahead, self.started - self.consumed)
+            self.lock.notify_all()
+            # Hold the first reads until enough of them run at the same time.
+            self.lock.wait_for(lambda: self.started >= self.rendezvous, timeout=5)
+            self.active -= 1
+        return f"# {path}\n"
+
+    def read_all(self, io, paths):
+        results = []
+        with io:
+            for path, _, read in io.read_ahead(paths, lambda path: FileLimits()):
+                results.append((path, read()))
+                with self.lock:
+                    self.consumed += 1
+        return results
+
+
+def test_prefetch_preserves_discovery_order():
+    paths = [f"app{i}/models.py" for i in range(10)]
+    reader = RecordingReader()
+
+    results = reader.read_all(PrefetchingIO(workers=4, read=reader), paths)
+
+    assert results == [(path, f"# {path}\n") for path in paths]
+
+
+def test_prefetch_overlaps_reads_within_window():
+    paths = [f"app{i}/models.py" for i in range(10)]
+    reader = RecordingReader()
+
+    reader.read_all(PrefetchingIO(workers=2, window=3, read=reader), paths)
+
+    assert reader.peak_active == 2
+    # The window counts files read ahead of the one being analysed.
+    assert reader.peak_ahead <= 3 + 1
+
+
+def test_serial_mode_reads_one_file_at_a_time():
+    paths = [f"app{i}/models.py" for i in range(5)]
+    reader = RecordingReader(rendezvous=1)
+
+    reader.read_all(PrefetchingIO(workers=0, read=reader), paths)
+
+    assert (reader.peak_active, reader.peak_ahead) == (1, 1)
+
+
+def test_first_file_is_handed_out_before_slow_discovery_finds_the_next():
+    received = threading.Event()
+    found_second = []
+
+    def discover():
+        yield "a/models.py"
+        # Simulates a slow directory listing on a network volume.
+        received.wait(timeout=5)
+        found_second.append(True)
+        yield "b/models.py"
+
+    io = PrefetchingIO(workers=2, read=lambda path, limits: "")
+    with io:
+        files = io.read_ahead(discover(), lambda path: FileLimits())
+        path, _, read = next(files)
+        assert (path, found_second) == ("a/models.py", [])
+        received.set()
+        assert [path for path, _, _ in files] == ["b/models.py"]
+
+
+def test_prefetch_reduces_time_waiting_on_delayed_reads():
+    paths = [f"app{i}/models.py" for i in range(8)]
+
+    def delayed_read(path, limits):
+        time.sleep(0.02)
+        return ""
+
+    def run(workers):
+        io = PrefetchingIO(workers=workers, read=delayed_read)
+        with io:
+            for _, _, read in io.read_ahead(paths, lambda path: FileLimits()):
+                read()
+                time.sleep(0.02)  # stands in for analysis
+        return io.read_wait
+
+    serial_wait = run(workers=0)
+    prefetched_wait = run(workers=4)
+
+    assert serial_wait >= 8 * 0.02
+    assert prefetched_wait < serial_wait / 2
+
+
+def test_negative_io_settings_in_config_are_rejected(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[tool.django-typify]\nio-threads = -1\n")
+
+    with pytest.raises(ConfigError):
+        load_prefetching_io(str(tmp_path))
+
+
+def test_discovery_errors_reach_the_caller():
+    def discover():
+        yield "app/models.py"
+        raise OSError("network volume went away")
+
+    io = PrefetchingIO(workers=2, read=lambda path, limits: "")
+    with pytest.raises(OSError):
+        with io:
+            list(io.read_ahead(discover(), lambda path: FileLimits()))
+
+
+def test_write_outcome_is_reported_after_the_write_resolves():
+    written = {}
+    release = threading.Event()
+    outcomes = []
+
+    def slow_write(path, source):
+        release.wait(timeout=5)
+        written[path] = source
+
+    with PrefetchingIO(workers=2, window=4, write=slow_write) as io:
+        io.write("models.py", "x = 1\n", lambda future: outcomes.append(future))
+        assert outcomes == []
+        release.set()
+
+    assert written == {"models.py": "x = 1\n"}
+    assert len(outcomes) == 1 and outcomes[0].exception() is None
+
+
+def test_pending_writes_are_bounded_by_window():
+    with PrefetchingIO(workers=2, window=2, write=lambda path, source: None) as io:
+        for i in range(10):
+            io.write(f"app{i}/models.py", "", lambda future: None)
+            assert len(io._pending_writes) <= 2
+
+
+def test_failed_write_stops_the_run():
+    def failing_write(path, source):
+        raise OSError("read-only file system")
+
+    io = PrefetchingIO(workers=2, write=failing_write)
+    with pytest.raises(OSError):
+        with io:
+            io.write("models.py", "", lambda future: future.result())